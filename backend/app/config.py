@@ -5,6 +5,18 @@ from pathlib import Path
 class Settings(BaseSettings):
     # Whisper settings
     whisper_model: str = "small"
+    # "faster" uses the CTranslate2 backend (faster-whisper) with INT8/FP16
+    # quantization; "openai" uses the reference openai-whisper implementation
+    whisper_backend: str = "faster"
+    # Batch size for the CTranslate2 batched decoder (chunks decoded in
+    # parallel within a file); only used with the "faster" backend
+    whisper_batch_size: int = 8
+    # CTranslate2 compute type override; defaults to int8_float16 on CUDA
+    # and int8 on CPU when empty
+    whisper_compute_type: str = ""
+    # Load the model and decode a second of silence at startup so the
+    # first real job doesn't pay the warm-up cost
+    whisper_prewarm: bool = True
     
     # Diarization settings
     # Set to False to disable speaker diarization (useful if models aren't downloaded)
@@ -17,6 +17,10 @@ async def lifespan(app: FastAPI):
     print(f"Transcript storage: {settings.transcript_storage_path}")
     ai_model = settings.ai_assistant_ollama_model if settings.ai_assistant_provider == "ollama" else settings.ai_assistant_model
     print(f"AI Assistant: {'enabled' if settings.ai_assistant_enabled else 'disabled'} ({settings.ai_assistant_provider}/{ai_model})")
+    if settings.whisper_prewarm:
+        from .services.transcriber import transcriber_service
+        transcriber_service.prewarm()
+        print("Whisper model pre-warm started")
     yield
     # Cleanup code can go here
 
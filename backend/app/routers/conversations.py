@@ -1,6 +1,5 @@
 from datetime import datetime
 from typing import List, Optional
-import json
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
@@ -8,6 +7,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import Conversation, Transcription
 from ..schemas import (
+    parse_json_value,
     ConversationCreate,
     ConversationResponse,
     ConversationList,
@@ -218,12 +218,12 @@ async def get_conversation_transcript(conversation_id: int, db: Session = Depend
         # Parse speaker segments if available
         if chunk.transcript_segments:
             try:
-                segments_data = json.loads(chunk.transcript_segments)
+                segments_data = parse_json_value(chunk.transcript_segments)
                 if segments_data.get("full_text"):
                     speaker_transcripts.append(segments_data["full_text"])
                 if segments_data.get("speakers"):
                     all_speakers.update(segments_data["speakers"])
-            except (json.JSONDecodeError, TypeError):
+            except (ValueError, TypeError):
                 pass
     
     full_transcript = " ".join(transcripts)
@@ -3,6 +3,18 @@ from datetime import datetime
 from typing import Optional, List, Any, Union
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def parse_json_value(value: str):
+    """Parse a JSON column value, preferring orjson's C parser."""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
 
 # Diarization segment schemas
 
@@ -79,8 +91,8 @@ class TranscriptionResponse(BaseModel):
             return None
         if isinstance(v, str):
             try:
-                return json.loads(v)
-            except (json.JSONDecodeError, TypeError):
+                return parse_json_value(v)
+            except (ValueError, TypeError):
                 return None
         return v
     
@@ -92,8 +104,8 @@ class TranscriptionResponse(BaseModel):
             return None
         if isinstance(v, str):
             try:
-                return json.loads(v)
-            except (json.JSONDecodeError, TypeError):
+                return parse_json_value(v)
+            except (ValueError, TypeError):
                 return None
         return v
     
@@ -180,8 +192,8 @@ class ConversationChunkResponse(BaseModel):
             return None
         if isinstance(v, str):
             try:
-                return json.loads(v)
-            except (json.JSONDecodeError, TypeError):
+                return parse_json_value(v)
+            except (ValueError, TypeError):
                 return None
         return v
     
@@ -193,8 +205,8 @@ class ConversationChunkResponse(BaseModel):
             return None
         if isinstance(v, str):
             try:
-                return json.loads(v)
-            except (json.JSONDecodeError, TypeError):
+                return parse_json_value(v)
+            except (ValueError, TypeError):
                 return None
         return v
     
@@ -16,192 +16,244 @@ Usage:
     # Merge with Whisper transcript
     result = diarizer_service.merge_with_transcript(whisper_segments, diarization_segments)
 """
+import functools
 import json
 import os
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-import torch
 from ..config import settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Path to local models directory
 MODELS_DIR = Path(__file__).parent.parent.parent / "models" / "pyannote"
 
 
+def _assign_speakers(w_starts, w_ends, d_starts, d_ends):
+    """
+    Vectorized whisper-to-diarization speaker assignment.
+
+    For each whisper segment, compute its temporal overlap against every
+    diarization segment in one NumPy broadcast and pick the index of the
+    best-overlapping one. Returns an int array with -1 where a segment
+    has no overlap at all.
+
+    This replaces a Python double loop that showed up in profiles on
+    long recordings (N whisper segments x M diarization segments).
+    """
+    import numpy as np
+
+    overlap = (
+        np.minimum(w_ends[:, None], d_ends[None, :])
+        - np.maximum(w_starts[:, None], d_starts[None, :])
+    )
+    np.clip(overlap, 0.0, None, out=overlap)
+
+    best = overlap.argmax(axis=1)
+    best[overlap.max(axis=1) <= 0.0] = -1
+    return best
+
+
+@functools.lru_cache(maxsize=2)
+def _build_pipeline(device_str: str, segmentation_batch_size: int, embedding_batch_size: int):
+    """
+    Build the diarization pipeline from local model files and move it
+    to the given device.
+
+    This constructs the pipeline manually using locally downloaded models,
+    avoiding network requests entirely.
+
+    The speaker-diarization-3.1 pipeline uses AgglomerativeClustering
+    (not VBx/PLDA), so we don't need PLDA models.
+
+    Cached by (device, batch sizes) so re-initialization - e.g. a CPU
+    fallback after GPU OOM, or tests resetting DiarizerService._pipeline -
+    reuses the already-loaded models instead of paying the 10+ second
+    load again.
+    """
+    import torch
+    from pyannote.audio.pipelines import SpeakerDiarization
+    from pyannote.audio import Model
+
+    segmentation_dir = MODELS_DIR / "segmentation-3.0"
+    embedding_dir = MODELS_DIR / "wespeaker-voxceleb-resnet34-LM"
+
+    # Check all required files exist
+    required_files = [
+        segmentation_dir / "config.yaml",
+        segmentation_dir / "pytorch_model.bin",
+        embedding_dir / "config.yaml",
+        embedding_dir / "pytorch_model.bin",
+    ]
+
+    for f in required_files:
+        if not f.exists():
+            raise FileNotFoundError(f"Missing model file: {f}")
+
+    print(f"Loading segmentation model from: {segmentation_dir}")
+    segmentation_model = Model.from_pretrained(segmentation_dir / "pytorch_model.bin")
+
+    print(f"Loading embedding model from: {embedding_dir}")
+    embedding_model = Model.from_pretrained(embedding_dir / "pytorch_model.bin")
+
+    # Create the pipeline with local models using AgglomerativeClustering
+    pipeline = SpeakerDiarization(
+        segmentation=segmentation_model,
+        embedding=embedding_model,
+        clustering="AgglomerativeClustering",
+        segmentation_batch_size=segmentation_batch_size,
+        embedding_batch_size=embedding_batch_size,
+        embedding_exclude_overlap=True,
+    )
+
+    # Set default parameters (from the speaker-diarization-3.1 config)
+    pipeline.instantiate({
+        "clustering": {
+            "method": "centroid",
+            "min_cluster_size": 12,
+            "threshold": 0.7045654963945799,
+        },
+        "segmentation": {
+            "min_duration_off": 0.0,
+        },
+    })
+
+    pipeline.to(torch.device(device_str))
+
+    return pipeline
+
+
 class DiarizerService:
     """Speaker diarization service using pyannote-audio."""
-    
+
     _pipeline = None
     _device = None
-    
-    @classmethod
-    def _load_local_pipeline(cls):
-        """
-        Load the diarization pipeline from local model files.
-        
-        This constructs the pipeline manually using locally downloaded models,
-        avoiding network requests entirely.
-        
-        The speaker-diarization-3.1 pipeline uses AgglomerativeClustering 
-        (not VBx/PLDA), so we don't need PLDA models.
-        """
-        from pyannote.audio.pipelines import SpeakerDiarization
-        from pyannote.audio import Model
-        
-        segmentation_dir = MODELS_DIR / "segmentation-3.0"
-        embedding_dir = MODELS_DIR / "wespeaker-voxceleb-resnet34-LM"
-        
-        # Check all required files exist
-        required_files = [
-            segmentation_dir / "config.yaml",
-            segmentation_dir / "pytorch_model.bin",
-            embedding_dir / "config.yaml",
-            embedding_dir / "pytorch_model.bin",
-        ]
-        
-        for f in required_files:
-            if not f.exists():
-                raise FileNotFoundError(f"Missing model file: {f}")
-        
-        print(f"Loading segmentation model from: {segmentation_dir}")
-        segmentation_model = Model.from_pretrained(segmentation_dir / "pytorch_model.bin")
-        
-        print(f"Loading embedding model from: {embedding_dir}")
-        embedding_model = Model.from_pretrained(embedding_dir / "pytorch_model.bin")
-        
-        
-        # Create the pipeline with local models using AgglomerativeClustering
-        pipeline = SpeakerDiarization(
-            segmentation=segmentation_model,
-            embedding=embedding_model,
-            clustering="AgglomerativeClustering",
-            segmentation_batch_size=32,
-            embedding_batch_size=32,
-            embedding_exclude_overlap=True,
-        )
-        
-        # Set default parameters (from the speaker-diarization-3.1 config)
-        pipeline.instantiate({
-            "clustering": {
-                "method": "centroid",
-                "min_cluster_size": 12,
-                "threshold": 0.7045654963945799,
-            },
-            "segmentation": {
-                "min_duration_off": 0.0,
-            },
-        })
-        
-        return pipeline
-    
+    _lock = threading.Lock()
+
     @classmethod
     def get_pipeline(cls):
         """
         Lazily load the pyannote diarization pipeline.
-        
+
         The pipeline is loaded once and cached for subsequent calls.
-        
+        Double-checked locking ensures concurrent first requests don't
+        each load their own copy of the models into RAM.
+
         Loading order:
         1. Local models directory (backend/models/pyannote/)
         2. HuggingFace cache (offline mode)
         3. HuggingFace Hub (online download)
         """
         if cls._pipeline is None:
-            print("Loading pyannote speaker diarization pipeline...")
-            
-            try:
-                from pyannote.audio import Pipeline
-            except ImportError:
-                raise ImportError(
-                    "pyannote.audio is not installed. "
-                    "Run: pip install pyannote.audio>=3.1.0"
-                )
-            
-            # Determine device
-            if torch.cuda.is_available():
-                cls._device = torch.device("cuda")
-                print("Using GPU for diarization")
-            elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-                cls._device = torch.device("mps")
-                print("Using Apple Silicon MPS for diarization")
-            else:
-                cls._device = torch.device("cpu")
-                print("Using CPU for diarization (this may be slow)")
-            
-            # Option 1: Try loading from local models directory
-            segmentation_model = MODELS_DIR / "segmentation-3.0" / "pytorch_model.bin"
-            embedding_model = MODELS_DIR / "wespeaker-voxceleb-resnet34-LM" / "pytorch_model.bin"
-            
-            if segmentation_model.exists() and embedding_model.exists():
-                try:
-                    print(f"Loading from local models: {MODELS_DIR}")
-                    cls._pipeline = cls._load_local_pipeline()
-                    cls._pipeline.to(cls._device)
-                    print(f"Diarization pipeline loaded from local models on {cls._device}")
-                    return cls._pipeline
-                except Exception as local_error:
-                    print(f"Local models load failed: {local_error}")
-                    import traceback
-                    traceback.print_exc()
-            
-            # Option 2: Try loading from HuggingFace cache (offline mode)
-            try:
-                print("Attempting to load from HuggingFace cache (offline mode)...")
-                os.environ["HF_HUB_OFFLINE"] = "1"
-                cls._pipeline = Pipeline.from_pretrained(
-                    "pyannote/speaker-diarization-3.1",
-                    use_auth_token=settings.hf_token
-                )
-                cls._pipeline.to(cls._device)
-                print(f"Diarization pipeline loaded from cache on {cls._device}")
-                return cls._pipeline
-            except Exception as cache_error:
-                print(f"Cache load failed: {cache_error}")
-            
-            # Option 3: Try downloading from HuggingFace Hub
-            print("Attempting to download models (this requires internet)...")
-            os.environ["HF_HUB_OFFLINE"] = "0"
-            try:
-                cls._pipeline = Pipeline.from_pretrained(
-                    "pyannote/speaker-diarization-3.1",
-                    use_auth_token=settings.hf_token
-                )
-                cls._pipeline.to(cls._device)
-                print(f"Diarization pipeline downloaded and loaded on {cls._device}")
-            except Exception as download_error:
-                raise RuntimeError(
-                    f"Failed to load diarization pipeline: {download_error}\n\n"
-                    "To fix this, manually download the models:\n"
-                    "1. See: backend/models/DOWNLOAD_INSTRUCTIONS.md\n"
-                    "2. Download files from HuggingFace to backend/models/pyannote/\n"
-                    "3. Restart the server"
-                )
-        
+            with cls._lock:
+                if cls._pipeline is None:
+                    cls._pipeline = cls._load_pipeline()
         return cls._pipeline
+
+    @classmethod
+    def _load_pipeline(cls):
+        """Load the pipeline, trying local models, HF cache, then HF Hub."""
+        print("Loading pyannote speaker diarization pipeline...")
+
+        import torch
+
+        try:
+            from pyannote.audio import Pipeline
+        except ImportError:
+            raise ImportError(
+                "pyannote.audio is not installed. "
+                "Run: pip install pyannote.audio>=3.1.0"
+            )
+
+        # Determine device
+        if torch.cuda.is_available():
+            cls._device = torch.device("cuda")
+            print("Using GPU for diarization")
+        elif hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
+            cls._device = torch.device("mps")
+            print("Using Apple Silicon MPS for diarization")
+        else:
+            cls._device = torch.device("cpu")
+            print("Using CPU for diarization (this may be slow)")
+
+        # Option 1: Try loading from local models directory
+        segmentation_model = MODELS_DIR / "segmentation-3.0" / "pytorch_model.bin"
+        embedding_model = MODELS_DIR / "wespeaker-voxceleb-resnet34-LM" / "pytorch_model.bin"
+
+        if segmentation_model.exists() and embedding_model.exists():
+            try:
+                print(f"Loading from local models: {MODELS_DIR}")
+                pipeline = _build_pipeline(str(cls._device), 32, 32)
+                print(f"Diarization pipeline loaded from local models on {cls._device}")
+                return pipeline
+            except Exception as local_error:
+                print(f"Local models load failed: {local_error}")
+                import traceback
+                traceback.print_exc()
+
+        # Option 2: Try loading from HuggingFace cache (offline mode)
+        try:
+            print("Attempting to load from HuggingFace cache (offline mode)...")
+            os.environ["HF_HUB_OFFLINE"] = "1"
+            pipeline = Pipeline.from_pretrained(
+                "pyannote/speaker-diarization-3.1",
+                use_auth_token=settings.hf_token
+            )
+            pipeline.to(cls._device)
+            print(f"Diarization pipeline loaded from cache on {cls._device}")
+            return pipeline
+        except Exception as cache_error:
+            print(f"Cache load failed: {cache_error}")
+
+        # Option 3: Try downloading from HuggingFace Hub
+        print("Attempting to download models (this requires internet)...")
+        os.environ["HF_HUB_OFFLINE"] = "0"
+        try:
+            pipeline = Pipeline.from_pretrained(
+                "pyannote/speaker-diarization-3.1",
+                use_auth_token=settings.hf_token
+            )
+            pipeline.to(cls._device)
+            print(f"Diarization pipeline downloaded and loaded on {cls._device}")
+            return pipeline
+        except Exception as download_error:
+            raise RuntimeError(
+                f"Failed to load diarization pipeline: {download_error}\n\n"
+                "To fix this, manually download the models:\n"
+                "1. See: backend/models/DOWNLOAD_INSTRUCTIONS.md\n"
+                "2. Download files from HuggingFace to backend/models/pyannote/\n"
+                "3. Restart the server"
+            )
     
     @classmethod
     def diarize(
-        cls, 
-        audio_path: str, 
+        cls,
+        audio,
         num_speakers: Optional[int] = None,
         min_speakers: Optional[int] = None,
         max_speakers: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
-        Perform speaker diarization on an audio file.
-        
+        Perform speaker diarization on an audio file or pre-loaded waveform.
+
         Args:
-            audio_path: Path to the audio file
+            audio: Path to the audio file, or a dict of
+                {"waveform": Tensor (channels, samples), "sample_rate": int}
+                with already-decoded audio (avoids a second decode when the
+                transcription pipeline has the samples in memory)
             num_speakers: Exact number of speakers (if known)
             min_speakers: Minimum number of speakers (if num_speakers not set)
             max_speakers: Maximum number of speakers (if num_speakers not set)
-        
+
         Returns:
             List of segments: [{"start": 0.0, "end": 3.5, "speaker": "SPEAKER_00"}, ...]
         """
-        import torchaudio
-        
         pipeline = cls.get_pipeline()
-        
+
         # Build diarization parameters
         params = {}
         if num_speakers is not None:
@@ -211,14 +263,29 @@ class DiarizerService:
                 params["min_speakers"] = min_speakers
             if max_speakers is not None:
                 params["max_speakers"] = max_speakers
-        
-        print(f"Diarizing audio: {audio_path}")
+
         if params:
             print(f"Diarization params: {params}")
-        
-        # Pre-load audio using torchaudio to avoid torchcodec issues
-        # pyannote expects a dict with 'waveform' and 'sample_rate' keys
-        waveform, sample_rate = torchaudio.load(audio_path)
+
+        # pyannote expects a dict with 'waveform' and 'sample_rate' keys;
+        # pre-loading (or being handed) the audio avoids torchcodec issues
+        # and redundant decodes
+        if isinstance(audio, dict):
+            waveform = audio["waveform"]
+            sample_rate = audio["sample_rate"]
+            print("Diarizing pre-loaded waveform")
+        else:
+            import torchaudio
+
+            print(f"Diarizing audio: {audio}")
+            waveform, sample_rate = torchaudio.load(audio)
+        waveform = waveform.contiguous()
+
+        # Pin host memory on CUDA so the pipeline's internal .to(device)
+        # transfers run as async DMA copies instead of staged pageable copies
+        if cls._device is not None and cls._device.type == "cuda":
+            waveform = waveform.pin_memory()
+
         audio_input = {"waveform": waveform, "sample_rate": sample_rate}
         
         # Run diarization with pre-loaded audio
@@ -232,15 +299,25 @@ class DiarizerService:
             # Old API returns Annotation directly
             diarization = diarization_output
         
-        # Extract segments
-        segments = []
+        # Extract segments - collect raw floats and round once with NumPy
+        # instead of calling round() per element
+        import numpy as np
+
+        starts = []
+        ends = []
+        speakers = []
         for turn, _, speaker in diarization.itertracks(yield_label=True):
-            segments.append({
-                "start": round(turn.start, 3),
-                "end": round(turn.end, 3),
-                "speaker": speaker
-            })
-        
+            starts.append(turn.start)
+            ends.append(turn.end)
+            speakers.append(speaker)
+
+        starts = np.round(starts, 3).tolist()
+        ends = np.round(ends, 3).tolist()
+        segments = [
+            {"start": s, "end": e, "speaker": spk}
+            for s, e, spk in zip(starts, ends, speakers)
+        ]
+
         # Sort by start time
         segments.sort(key=lambda x: x["start"])
         
@@ -252,59 +329,88 @@ class DiarizerService:
     
     @classmethod
     def merge_with_transcript(
-        cls, 
-        whisper_segments: List[Dict], 
-        diarization_segments: List[Dict]
+        cls,
+        whisper_segments: List[Dict],
+        diarization_segments: List[Dict],
+        include_full_text: bool = True
     ) -> Dict[str, Any]:
         """
         Merge Whisper transcript segments with speaker diarization.
-        
-        Assigns speaker labels to each transcript segment based on 
+
+        Assigns speaker labels to each transcript segment based on
         which speaker has the most temporal overlap with that segment,
         then consolidates consecutive segments from the same speaker
         into paragraphs.
-        
+
         Args:
             whisper_segments: Segments from Whisper with 'start', 'end', 'text'
             diarization_segments: Segments from diarize() with 'start', 'end', 'speaker'
-        
+            include_full_text: Whether to build the formatted 'full_text'
+                transcript. Batch callers that only consume 'segments'
+                can pass False to skip the extra formatting pass.
+
         Returns:
             Dict with:
             - segments: List of consolidated segments (paragraphs) with speaker labels
             - raw_segments: List of original segments with speaker labels (for detailed view)
             - speakers: List of unique speaker IDs
             - full_text: Formatted transcript with speaker labels
+              (empty string when include_full_text is False)
         """
-        # First, assign speakers to each Whisper segment
+        # First, collect non-empty Whisper segments
         raw_segments = []
-        
+
         for seg in whisper_segments:
             start = seg.get("start", 0)
             end = seg.get("end", 0)
             text = seg.get("text", "").strip()
-            
+
             # Skip empty segments
             if not text:
                 continue
-            
-            # Find speaker with most overlap
-            speaker = cls._find_speaker_for_segment(start, end, diarization_segments)
-            
+
             raw_segments.append({
-                "start": round(start, 3),
-                "end": round(end, 3),
+                "start": start,
+                "end": end,
                 "text": text,
-                "speaker": speaker
+                "speaker": "UNKNOWN"
             })
-        
+
+        if raw_segments:
+            import numpy as np
+
+            # Assign the best-overlapping speaker to each segment in one
+            # vectorized pass instead of a Python double loop
+            if diarization_segments:
+                w_starts = np.array([s["start"] for s in raw_segments])
+                w_ends = np.array([s["end"] for s in raw_segments])
+                d_starts = np.array([d["start"] for d in diarization_segments])
+                d_ends = np.array([d["end"] for d in diarization_segments])
+
+                best = _assign_speakers(w_starts, w_ends, d_starts, d_ends)
+                for seg, idx in zip(raw_segments, best):
+                    if idx >= 0:
+                        seg["speaker"] = diarization_segments[idx]["speaker"]
+
+            # Round timestamps in one vectorized pass rather than per segment
+            starts = np.round([s["start"] for s in raw_segments], 3).tolist()
+            ends = np.round([s["end"] for s in raw_segments], 3).tolist()
+            for seg, s, e in zip(raw_segments, starts, ends):
+                seg["start"] = s
+                seg["end"] = e
+
+
         # Consolidate consecutive segments from the same speaker into paragraphs
         consolidated_segments = cls._consolidate_speaker_segments(raw_segments)
         
         # Get unique speakers
         speakers = sorted(set(s["speaker"] for s in raw_segments))
         
-        # Build formatted full text with speaker labels
-        full_text = cls._format_transcript_with_speakers(consolidated_segments)
+        # Build formatted full text with speaker labels (skippable for
+        # callers that only need the segments)
+        full_text = ""
+        if include_full_text:
+            full_text = cls._format_transcript_with_speakers(consolidated_segments)
         
         return {
             "segments": consolidated_segments,  # Consolidated paragraphs
@@ -392,20 +498,20 @@ class DiarizerService:
         Returns:
             Speaker ID (e.g., "SPEAKER_00") or "UNKNOWN"
         """
-        best_speaker = "UNKNOWN"
-        best_overlap = 0.0
-        
-        for d in diarization_segments:
-            # Calculate overlap
-            overlap_start = max(start, d["start"])
-            overlap_end = min(end, d["end"])
-            overlap = max(0.0, overlap_end - overlap_start)
-            
-            if overlap > best_overlap:
-                best_overlap = overlap
-                best_speaker = d["speaker"]
-        
-        return best_speaker
+        if not diarization_segments:
+            return "UNKNOWN"
+
+        import numpy as np
+
+        best = _assign_speakers(
+            np.array([start]),
+            np.array([end]),
+            np.array([d["start"] for d in diarization_segments]),
+            np.array([d["end"] for d in diarization_segments]),
+        )
+        if best[0] < 0:
+            return "UNKNOWN"
+        return diarization_segments[best[0]]["speaker"]
     
     @classmethod
     def _format_transcript_with_speakers(cls, consolidated_segments: List[Dict]) -> str:
@@ -442,7 +548,11 @@ class DiarizerService:
         Returns:
             JSON string
         """
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        # orjson is 3-10x faster than stdlib json for large segment lists;
+        # compact output (no indent) also halves the size of the DB row
+        if orjson is not None:
+            return orjson.dumps(result).decode()
+        return json.dumps(result, ensure_ascii=False)
     
     @classmethod
     def segments_from_json(cls, json_str: str) -> Dict[str, Any]:
@@ -457,8 +567,21 @@ class DiarizerService:
         """
         if not json_str:
             return {"segments": [], "speakers": [], "full_text": ""}
+        if orjson is not None:
+            return orjson.loads(json_str)
         return json.loads(json_str)
 
 
-# Singleton instance
-diarizer_service = DiarizerService()
+# Singleton instance, created lazily via PEP 562 so that merely importing
+# this module (e.g. from short-lived CLI tools that never diarize) doesn't
+# pay for the heavy torch/pyannote import chain.
+_diarizer_service = None
+
+
+def __getattr__(name: str):
+    global _diarizer_service
+    if name == "diarizer_service":
+        if _diarizer_service is None:
+            _diarizer_service = DiarizerService()
+        return _diarizer_service
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,14 @@
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import json
 import traceback
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..models import Transcription, Conversation
 from .interfaces import TranscriptionProvider
 from .file_manager import file_manager
@@ -21,27 +26,28 @@ class TranscriptionService:
             transcription_id: ID of the transcription to process
             num_speakers: Number of speakers for diarization (overrides conversation setting)
         """
-        # Get transcription record
-        transcription = self.db.query(Transcription).filter(Transcription.id == transcription_id).first()
-        if not transcription:
+        # One joined round-trip for the record plus its conversation's
+        # speaker count, instead of a second SELECT on Conversation
+        row = (
+            self.db.query(Transcription, Conversation.num_speakers)
+            .outerjoin(Conversation, Conversation.id == Transcription.conversation_id)
+            .filter(Transcription.id == transcription_id)
+            .first()
+        )
+        if not row:
             print(f"Transcription {transcription_id} not found")
             return
+        transcription, conv_num_speakers = row
 
         try:
-            # Update status to processing
+            # Claim the job; everything else is written in one terminal
+            # commit, so each SQLite fsync covers a whole state change
             transcription.status = "processing"
             self.db.commit()
 
-            # Determine number of speakers
-            effective_num_speakers = num_speakers
-
-            # If not explicitly provided, check conversation settings
-            if effective_num_speakers is None and transcription.conversation_id:
-                conversation = self.db.query(Conversation).filter(
-                    Conversation.id == transcription.conversation_id
-                ).first()
-                if conversation and conversation.num_speakers:
-                    effective_num_speakers = conversation.num_speakers
+            effective_num_speakers = (
+                num_speakers if num_speakers is not None else conv_num_speakers
+            )
 
             # Perform transcription
             print(f"Starting transcription for {transcription.id} ({transcription.filename})")
@@ -54,25 +60,7 @@ class TranscriptionService:
                 num_speakers=effective_num_speakers
             )
 
-            # Save transcript to file
-            transcript_path = file_manager.save_transcript(transcription_id, result.text)
-
-            # Update record
-            transcription.transcript_path = transcript_path
-            transcription.transcript_text = result.text
-            transcription.detected_language = result.source_language
-            transcription.duration_sec = result.duration
-            transcription.is_hallucination = result.is_hallucination
-            transcription.status = "completed"
-            transcription.completed_at = datetime.utcnow()
-
-            # Save diarization segments if available
-            if result.transcript_segments:
-                transcription.transcript_segments = json.dumps(
-                    result.transcript_segments,
-                    ensure_ascii=False
-                )
-
+            self._store_result(transcription, result)
             self.db.commit()
             print(f"Transcription {transcription_id} completed successfully")
 
@@ -83,3 +71,90 @@ class TranscriptionService:
             transcription.status = "failed"
             transcription.error_message = str(e)
             self.db.commit()
+
+    def process_jobs(self, transcription_ids: List[int]):
+        """
+        Process several transcription jobs as a batch.
+
+        Jobs with the same language/trim/speaker settings are handed to
+        the provider's transcribe_many in one call, so files are
+        preprocessed concurrently and decoded back-to-back on a warm
+        model instead of paying per-job ramp-up N times.
+        """
+        rows = (
+            self.db.query(Transcription, Conversation.num_speakers)
+            .outerjoin(Conversation, Conversation.id == Transcription.conversation_id)
+            .filter(Transcription.id.in_(transcription_ids))
+            .all()
+        )
+        if not rows:
+            print(f"No transcriptions found for ids {transcription_ids}")
+            return
+
+        transcribe_many = getattr(self.provider, "transcribe_many", None)
+        if transcribe_many is None:
+            for transcription, _ in rows:
+                self.process_job(transcription.id)
+            return
+
+        for transcription, _ in rows:
+            transcription.status = "processing"
+        self.db.commit()
+
+        # Batch by the options transcribe_many applies uniformly
+        groups = {}
+        for transcription, conv_num_speakers in rows:
+            key = (
+                transcription.language,
+                bool(transcription.trim_silence),
+                conv_num_speakers,
+            )
+            groups.setdefault(key, []).append(transcription)
+
+        for (language, trim_silence, num_speakers), group in groups.items():
+            try:
+                results = transcribe_many(
+                    [t.audio_path for t in group],
+                    language=language,
+                    trim_silence=trim_silence,
+                    num_speakers=num_speakers
+                )
+                for transcription, result in zip(group, results):
+                    self._store_result(transcription, result)
+                self.db.commit()
+                print(f"Batch of {len(group)} transcription(s) completed successfully")
+            except Exception as e:
+                print(f"Batch transcription error: {e}")
+                traceback.print_exc()
+
+                for transcription in group:
+                    transcription.status = "failed"
+                    transcription.error_message = str(e)
+                self.db.commit()
+
+    def _store_result(self, transcription: Transcription, result):
+        """Write a completed result onto the record (caller commits)."""
+        # Save transcript to file
+        transcript_path = file_manager.save_transcript(transcription.id, result.text)
+
+        # Update record
+        transcription.transcript_path = transcript_path
+        transcription.transcript_text = result.text
+        transcription.detected_language = result.source_language
+        transcription.duration_sec = result.duration
+        transcription.is_hallucination = result.is_hallucination
+        transcription.status = "completed"
+        transcription.completed_at = datetime.utcnow()
+
+        # Save diarization segments if available; orjson serializes at
+        # C speed and always emits UTF-8, stdlib json is the fallback
+        if result.transcript_segments:
+            if orjson is not None:
+                transcription.transcript_segments = orjson.dumps(
+                    result.transcript_segments
+                ).decode()
+            else:
+                transcription.transcript_segments = json.dumps(
+                    result.transcript_segments,
+                    ensure_ascii=False
+                )